@@ -1,11 +1,44 @@
 import datetime
+import decimal
+import itertools
+import math
+import multiprocessing
+import multiprocessing.shared_memory
+import operator
+import os
+
 import numpy
 
+# numba is optional, without it the dynamic programming matrix is filled using numpy row operations
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# single bit masks for reading cells out of the bit-packed dynamic programming matrix
+BITS = numpy.uint64(1) << numpy.arange(64, dtype=numpy.uint64)
+
+# minimum number of words in a row of the dynamic programming matrix before the numba fill is parallelised
+PARALLEL_MIN_WORDS = 1 << 12
+
+# number of words of each row filled at a time by the numba fill, 128 KB so that the tile being read and the tile
+# being written both fit in the L2 cache
+TILE_WORDS = 1 << 14
+
+# largest dynamic programming matrix, in bits, that subset_sum builds to prune its search - larger targets are only
+# pruned by the sum of the remaining masses
+REACHABLE_MAX_BITS = 1 << 27
+
 
 def subset_sum(l, mass):
     """
-    Recursive subset sum algorithm for identifying sets of substructures that make up a given mass. Do not supply 0
-    values to this function, it will think these are unique subsets and therefore yield double the number of solutions.
+    Subset sum algorithm for identifying sets of substructures that make up a given mass. The search tree is explored
+    depth-first using an explicit stack, rather than recursively, which avoids the cost of creating a generator per node
+    and copying l at every level. A single list is used to keep track of the current subset and is only copied when a
+    solution is found. The masses are sorted from largest to smallest before searching, so that branches can be cut as
+    soon as the remaining masses are too small to reach the target; the masses in each subset are therefore also ordered
+    from largest to smallest. Do not supply 0 values to this function, it will think these are unique subsets and
+    therefore yield double the number of solutions.
 
     :param l: A list of masses from which to identify subsets.
 
@@ -14,31 +47,105 @@ def subset_sum(l, mass):
     :return: Generates of lists containing the masses of valid subsets.
     """
 
-    # we've overshot the target mass (no solution)
-    if mass < 0:
-        return
+    l = sorted(l, reverse=True)
 
-    # base case, yield a solution
-    elif (sum(l) - mass) == 0:
-        yield l
-        return
+    # sums[i] is the sum of l[i:], the most that the remaining masses can add up to
+    sums = list(itertools.accumulate(reversed(l), initial=0))[::-1]
 
-    # there are no (more) masses
-    elif len(l) == 0:
-        return
+    # for small integer masses, row len(l) - i of reachable has bit m set if a subset of l[i:] sums up to m
+    integer = isinstance(mass, int) and all(isinstance(m, int) for m in l)
+    reachable = suffix_dp(l, mass) if integer else None
+
+    # can a subset of l[i:] sum up to m? - otherwise masses can only be bounded by the remaining sum, as the matrix
+    # would be too large or, for floats, sums depend on the order they are added in
+    def feasible(i, m):
+        if m < 0 or m > sums[i]:
+            return False
+        elif reachable is not None:
+            return reachable[len(l) - i, m >> 6] & BITS[m & 63]
+
+        return True
+
+    # the current subset is shared between all nodes - each node holds the index of the next mass, the remaining
+    # target, the length of its parent's subset and whether it includes l[i-1]
+    path = []
+    stack = [(0, mass, 0, False)] if feasible(0, mass) else []
+
+    while stack:
+        i, remaining_mass, length, include = stack.pop()
+
+        # rewind the subset to this node's parent
+        del path[length:]
+        if include:
+            path.append(l[i-1])
+
+        # base case, yield a solution
+        if sums[i] == remaining_mass:
+            yield path + l[i:]
+            continue
 
-    # can we sum up to the target value with the remaining values? - recursive call
-    for subset in subset_sum(l[1:], mass):
-        yield subset
-    for subset in subset_sum(l[1:], mass - l[0]):
-        yield [l[0]] + subset
+        # there are no (more) masses
+        elif i == len(l):
+            continue
+
+        # can we sum up to the target value with the remaining values? - the exclude branch is pushed last so that it
+        # is explored first, and branches that cannot reach the target are never pushed
+        if l[i] <= remaining_mass and feasible(i+1, remaining_mass - l[i]):
+            stack.append((i+1, remaining_mass - l[i], len(path), True))
+        if sums[i+1] >= remaining_mass and feasible(i+1, remaining_mass):
+            stack.append((i+1, remaining_mass, len(path), False))
+
+
+def suffix_dp(l, mass):
+    """
+    Builds a dynamic programming matrix for pruning the subset_sum search, where bit j of row k is set if some subset
+    of the last k masses sums to j. The matrix is only built if it would hold at most REACHABLE_MAX_BITS bits.
+
+    :param l: A list of non-negative integer masses from which to identify subsets.
+
+    :param mass: The largest sum that needs to be looked up.
+
+    :return: The dynamic programming boolean matrix, bit-packed into rows of numpy.uint64 words, or None if it would be
+        too large or l contains negative masses.
+    """
+
+    if mass < 0 or (len(l) + 1) * (mass + 1) > REACHABLE_MAX_BITS or any(m < 0 for m in l):
+        return None
+
+    return build_dp(numpy.asarray(l[::-1], dtype=numpy.int64), mass)
+
+
+def to_int(l, mass, toll):
+    """
+    Scales masses to integers, so that non-exact subset sums can be found using integer rather than floating point
+    arithmetic. Masses are scaled by a power of ten large enough to hold every decimal place of the masses, target mass
+    and toll, so no value is rounded and sums of the scaled masses are exact.
+
+    :param l: A list of masses from which to identify subsets.
+
+    :param mass: The target mass of the sum of the substructures.
+
+    :param toll: The allowable deviation of the sum of subsets from the target mass.
+
+    :return: A tuple containing the scaled list of masses, target mass and toll.
+    """
+
+    # the shortest decimal representation of each value, as printed by python
+    values = [decimal.Decimal(str(m)) for m in [*l, mass, toll]]
+    places = max(0, *(-v.as_tuple().exponent for v in values))
+
+    scaled = [int(v.scaleb(places)) for v in values]
+
+    return scaled[:-2], scaled[-2], scaled[-1]
 
 
 def subset_sum_inexact(l, mass, toll=0.001):
     """
     Recursive subset sum algorithm for identifying sets of substructures that make up a given mass. We may define
-    toll, which allows for non-exact solutions. Do not supply 0 values to this function, it will think these are
-    unique subsets and therefore yield double the number of solutions.
+    toll, which allows for non-exact solutions. The search is carried out on masses scaled to integers by to_int, so
+    sums are compared to the target mass exactly, as written in decimal, without floating point error. Do not supply 0
+    values to this function, it will think these are unique subsets and therefore yield double the number of
+    solutions.
 
     :param l: A list of masses from which to identify subsets.
 
@@ -48,65 +155,368 @@ def subset_sum_inexact(l, mass, toll=0.001):
 
     :return: Generates of lists containing the masses of valid subsets.
     """
-    
-    # we've overshot the target mass (no solution)
-    if mass < -toll:
-        return
 
-    # base case, yield a solution
-    elif abs(sum(l) - mass) <= toll:
-        yield l
-        return
+    int_l, int_mass, int_toll = to_int(l, mass, toll)
 
-    # there are no (more) masses & mass is not at target
-    elif len(l) == 0:
-        return
+    # sums[i] is the sum of l[i:], calculated once rather than at every node
+    sums = list(itertools.accumulate(reversed(int_l), initial=0))[::-1]
+
+    # the current subset, shared by every call and only copied when a solution is found
+    path = []
+
+    def search(i, m):
+
+        # we've overshot the target mass (no solution)
+        if m < -int_toll:
+            return
+
+        # base case, yield a solution
+        elif abs(sums[i] - m) <= int_toll:
+            yield path + l[i:]
+            return
+
+        # there are no (more) masses & mass is not at target
+        elif i == len(l):
+            return
+
+        # can we sum up to the target value with the remaining values? - recursive call, skipping branches where even
+        # all of the remaining masses fall short of the target
+        if m - int_toll <= sums[i+1]:
+            yield from search(i+1, m)
+        if -int_toll <= m - int_l[i] <= sums[i+1] + int_toll:
+            path.append(l[i])
+            yield from search(i+1, m - int_l[i])
+            path.pop()
+
+    return search(0, int_mass)
+
+
+def shift_left(bits, k):
+    """
+    Shifts a bit-packed row of the dynamic programming matrix towards higher masses. Bit j of the row is stored in
+    word j // 64 at position j % 64, so the shift is split into whole words plus a carry between neighbouring words.
+
+    :param bits: A numpy.uint64 array holding a single bit-packed row.
+
+    :param k: The number of bits (mass units) to shift by.
+
+    :return: A new numpy.uint64 array of the same size, with bit j + k set for each bit j set in bits.
+    """
+
+    word_off, bit_off = k >> 6, k & 63
+    out = numpy.zeros_like(bits)
+
+    # the whole row has been shifted past the largest mass
+    if word_off >= len(bits):
+        return out
 
-    # can we sum up to the target value with the remaining values? - recursive call
-    for subset in subset_sum_inexact(l[1:], mass):
-        yield subset
-    for subset in subset_sum_inexact(l[1:], mass - l[0]):
-        yield [l[0]] + subset
+    out[word_off:] = bits[:len(bits) - word_off] << numpy.uint64(bit_off)
 
+    # carry the high bits of each word into the low bits of the next word
+    if bit_off:
+        out[word_off + 1:] |= bits[:len(bits) - word_off - 1] >> numpy.uint64(64 - bit_off)
 
-def find_path(l, dp, n, mass, max_subset_length, path=[]):
+    return out
+
+
+def fill_dp(dp, l):
     """
-    Recursive solution for backtracking through the dynamic programming boolean matrix. All possible subsets are found
+    Fills the bit-packed dynamic programming matrix using numpy, each row is the previous row OR'd with itself shifted
+    by the corresponding mass. Used when numba is not available.
+
+    :param dp: The dynamic programming boolean matrix, bit-packed into rows of numpy.uint64 words. The first column
+        must already be set.
 
     :param l: A list of masses from which to identify subsets.
+    """
 
-    :param mass: The target mass of the sum of the substructures.
+    for i in range(len(l)):
+        dp[i+1] = dp[i] | shift_left(dp[i], l[i])
+
+
+if numba is not None:
+
+    @numba.njit(cache=True, nogil=True, boundscheck=False)
+    def shift_or_words(row, nxt, k, start, stop):
+        """
+        Sets words start to stop of nxt to the same words of row OR'd with row shifted by k bits, compiled with numba.
+        Only row is read, so disjoint ranges of words can be filled independently.
+
+        :param row: A numpy.uint64 array holding the previous bit-packed row.
+
+        :param nxt: A numpy.uint64 array to hold the next bit-packed row.
+
+        :param k: The number of bits (mass units) to shift by.
+
+        :param start: The first word to fill.
+
+        :param stop: The word after the last word to fill.
+        """
+
+        word_off, bit_off = k >> 6, k & 63
+        hi_shift, lo_shift = numpy.uint64(bit_off), numpy.uint64(64 - bit_off)
+
+        # words below the shift are copied unchanged
+        w = min(max(start, word_off), stop)
+        for j in range(start, w):
+            nxt[j] = row[j]
+
+        if w == stop:
+            return
+
+        if w == word_off:
+            nxt[w] = row[w] | (row[0] << hi_shift)
+            w += 1
+
+        # carry the high bits of each word into the low bits of the next word
+        if bit_off:
+            for j in range(w, stop):
+                nxt[j] = row[j] | (row[j - word_off] << hi_shift) | (row[j - word_off - 1] >> lo_shift)
+        else:
+            for j in range(w, stop):
+                nxt[j] = row[j] | row[j - word_off]
+
+    @numba.njit(cache=True, nogil=True, boundscheck=False)
+    def fill_dp(dp, l):
+        """
+        Fills the bit-packed dynamic programming matrix, compiled with numba. Equivalent to the numpy version above,
+        but each row is shifted and OR'd word by word in a single loop. Long rows are filled in tiles of TILE_WORDS
+        words, advancing every row through one tile before moving on to the next, so that the part of each row being
+        read is still in cache from being written. This is possible because a word only depends on the same or
+        earlier words of the previous row.
+
+        :param dp: The dynamic programming boolean matrix, bit-packed into rows of numpy.uint64 words. The first
+            column must already be set.
+
+        :param l: A numpy.int64 array of masses from which to identify subsets.
+        """
+
+        words = dp.shape[1]
+
+        for start in range(0, words, TILE_WORDS):
+            stop = min(start + TILE_WORDS, words)
+
+            for i in range(l.shape[0]):
+                shift_or_words(dp[i], dp[i+1], l[i], start, stop)
+
+    @numba.njit(parallel=True, cache=True, nogil=True, boundscheck=False)
+    def fill_dp_parallel(dp, l, blocks):
+        """
+        Fills the bit-packed dynamic programming matrix, with each row split into one block of words per numba
+        thread. Rows must still be filled one after the other, but each word of a row only depends on the previous
+        row. As in fill_dp, long rows are filled in tiles of TILE_WORDS words, and each tile is split between the
+        threads.
+
+        :param dp: The dynamic programming boolean matrix, bit-packed into rows of numpy.uint64 words. The first
+            column must already be set.
+
+        :param l: A numpy.int64 array of masses from which to identify subsets.
+
+        :param blocks: The number of blocks to split each tile into, usually numba.get_num_threads().
+        """
+
+        words = dp.shape[1]
+
+        for start in range(0, words, TILE_WORDS):
+            stop = min(start + TILE_WORDS, words)
+            block_size = (stop - start + blocks - 1) // blocks
 
-    :param dp: The dynamic programming boolean matrix.
+            for i in range(l.shape[0]):
+                for b in numba.prange(blocks):
+                    shift_or_words(dp[i], dp[i+1], l[i], min(start + b * block_size, stop),
+                                   min(start + (b + 1) * block_size, stop))
+
+
+def unroll_paths(group, root, suffix=()):
+    """
+    Generates the subsets held by a group of partial subsets created by enumerate_paths.
+
+    :param group: A list of (parent group, mass) pairs, where mass is the mass added to the parent's subsets, or None.
+
+    :param root: The group holding only the empty subset.
+
+    :param suffix: A tuple of masses to add to every subset.
+
+    :return: Generates tuples containing the masses of each subset.
+    """
+
+    stack = [(group, suffix)]
+
+    while stack:
+        group, suffix = stack.pop()
+
+        if group is root:
+            yield suffix
+            continue
+
+        for parent, added_mass in group:
+            stack.append((parent, suffix if added_mass is None else (added_mass,) + suffix))
+
+
+def enumerate_paths(l, dp, n, mass, max_subset_length, path=()):
+    """
+    Backtracks through the dynamic programming boolean matrix to find all possible subsets. Rather than backtracking
+    depth-first, which jumps between rows of the matrix, all partial subsets are advanced one row at a time from the
+    last row to the first, so each row is only read once. Partial subsets with the same remaining mass and length are
+    merged into a single group, so each state is only checked once however many subsets reach it; the subsets in a group
+    are only unrolled once the remaining mass reaches 0.
+
+    :param l: A list of masses from which to identify subsets.
+
+    :param dp: The dynamic programming boolean matrix, bit-packed into rows of numpy.uint64 words.
 
     :param n: The size of l.
 
-    :param max_subset_length: The maximum length of subsets to return. Allows the recursive backtracking algorithm to
-        terminate early in many cases, significantly improving runtime.
+    :param mass: The target mass of the sum of the substructures.
 
-    :param path: List for keeping track of the current subset.
+    :param max_subset_length: The maximum length of subsets to return.
 
-    :return: Generates of lists containing the masses of valid subsets.
+    :param path: Tuple of the masses in the subset to start from, which are added to every subset generated. Allows
+        a subtree of the backtracking tree, such as one created by split_paths, to be backtracked on its own.
+
+    :return: Generates tuples containing the masses of valid subsets.
     """
 
-    # base case - the path has generated a correct solution
+    # base case - the starting subset
     if mass == 0:
-        yield sorted(path)
+        yield path
         return
 
-    # stop running when we overshoot the mass
-    elif mass < 0:
-        return
+    # groups of partial subsets, keyed by their remaining mass and length
+    root = []
+    frontier = {(mass, len(path)): root} if 0 < mass and dp[n, mass >> 6] & BITS[mass & 63] else {}
 
-    # can we sum up to the target value using the remaining masses? recursive call
-    elif dp[n][mass]:
-        yield from find_path(l, dp, n-1, mass, max_subset_length, path)
+    for i in range(n, 0, -1):
+        # read the row once as python ints, which are much faster to index than numpy scalars
+        row, added_mass = dp[i-1].tolist(), l[i-1]
+        expanded = {}
 
-        if len(path) < max_subset_length:
-            path.append(l[n-1])
+        for (remaining_mass, length), group in frontier.items():
 
-            yield from find_path(l, dp, n-1, mass - l[n-1], max_subset_length, path)
-            path.pop()
+            # can we still sum up to the remaining mass without l[i-1]?
+            if row[remaining_mass >> 6] >> (remaining_mass & 63) & 1:
+                expanded.setdefault((remaining_mass, length), []).append((group, None))
+
+            if length < max_subset_length and added_mass <= remaining_mass:
+
+                # the path has generated a correct solution
+                if added_mass == remaining_mass:
+                    yield from unroll_paths(group, root, (added_mass,) + path)
+
+                # can we sum up to the remaining mass with l[i-1]?
+                elif row[(remaining_mass - added_mass) >> 6] >> ((remaining_mass - added_mass) & 63) & 1:
+                    expanded.setdefault((remaining_mass - added_mass, length + 1), []).append((group, added_mass))
+
+        # groups reached from a single group without adding a mass hold the same subsets, so reuse the original group
+        frontier = {state: group[0][0] if len(group) == 1 and group[0][1] is None else group
+                    for state, group in expanded.items()}
+
+
+def dp_shape(l, mass):
+    """
+    Gets the shape of the bit-packed dynamic programming matrix, with one row per mass in l (plus the empty subset)
+    and enough 64 bit words per row to hold a bit for each mass from 0 to the target mass.
+
+    :param l: A list of masses from which to identify subsets.
+
+    :param mass: The target mass of the sum of the substructures.
+
+    :return: A tuple containing the number of rows and words per row.
+    """
+
+    return len(l) + 1, (mass >> 6) + 1
+
+
+def int_masses(l):
+    """
+    Converts masses to a numpy.int64 array for the dynamic programming implementations, which use masses to index the
+    dynamic programming matrix. Non-integer masses are rejected rather than truncated, and negative masses are
+    rejected as they cannot be used as offsets into the matrix.
+
+    :param l: A list of masses from which to identify subsets.
+
+    :return: A numpy.int64 array of the masses in l.
+
+    :raises ValueError: If any of the masses are not integers or are negative.
+    """
+
+    masses = numpy.asarray(l)
+    int_l = masses.astype(numpy.int64)
+
+    if not numpy.array_equal(int_l, masses):
+        raise ValueError("Masses must be integers, use subset_sum_inexact for non-integer masses")
+    elif (int_l < 0).any():
+        raise ValueError("Masses must not be negative")
+
+    return int_l
+
+
+def sort_masses(l):
+    """
+    Checks and sorts masses for the dynamic programming implementations. Sorting l means that masses greater than the
+    target mass come last, so the dp fill can stop early.
+
+    :param l: A list of masses from which to identify subsets.
+
+    :return: A tuple containing the sorted masses as a numpy.int64 array, used by the dp fill, and as a list of python
+        ints, used for backtracking as they are faster to index and do arithmetic on than numpy scalars.
+
+    :raises ValueError: If any of the masses are not integers or are negative.
+    """
+
+    # int_masses returns a new array, so it can be sorted in place
+    masses = int_masses(l)
+    masses.sort()
+
+    return masses, masses.tolist()
+
+
+def build_dp(l, mass, buffer=None):
+    """
+    Builds the bit-packed dynamic programming matrix for subset sum, where bit j of row i is set if some subset of the
+    first i masses sums to j.
+
+    :param l: A numpy.int64 array of non-negative masses, such as one created by int_masses. The masses are not
+        checked again, as they are used to index the matrix without bounds checks.
+
+    :param mass: The target mass of the sum of the substructures.
+
+    :param buffer: An optional buffer, such as shared memory, to build the matrix in. Must hold at least
+        8 * rows * words bytes, see dp_shape.
+
+    :return: The dynamic programming boolean matrix, bit-packed into rows of numpy.uint64 words.
+    """
+
+    # initialise dynamic programming array, each row is packed into 64 bit words - empty subsets do not have
+    # non-zero sums
+    if buffer is None:
+        dp = numpy.zeros(dp_shape(l, mass), dtype=numpy.uint64)
+    else:
+        dp = numpy.ndarray(dp_shape(l, mass), dtype=numpy.uint64, buffer=buffer)
+        dp.fill(0)
+
+    # subsets can always equal 0
+    dp[:, 0] = 1
+
+    # masses greater than the target mass leave a row unchanged, so the rows after a trailing run of them (all rows
+    # after the first such mass, if l is sorted) don't need to be filled
+    stop = len(l)
+    while stop > 0 and l[stop-1] > mass:
+        stop -= 1
+
+    # fill in the remaining boolean matrix, each row is the previous row OR'd with itself shifted by l[i] - rows
+    # are only split between threads when rows are long enough to outweigh the cost of starting them and there is
+    # more than one thread - the row length is checked first, as asking numba for the number of threads starts its
+    # threading layer, which can hang a process that forks afterwards
+    if numba is not None and dp.shape[1] >= PARALLEL_MIN_WORDS and numba.config.NUMBA_NUM_THREADS > 1 and \
+            numba.get_num_threads() > 1:
+        fill_dp_parallel(dp[:stop+1], l[:stop], numba.get_num_threads())
+    else:
+        fill_dp(dp[:stop+1], l[:stop])
+
+    dp[stop+1:] = dp[stop]
+
+    return dp
 
 
 def subset_sum_dp(l, mass, max_subset_length=3):
@@ -121,34 +531,169 @@ def subset_sum_dp(l, mass, max_subset_length=3):
 
     :param mass: The target mass of the sum of the substructures.
 
-    :param max_subset_length: The maximum length of subsets to return. Allows the recursive backtracking algorithm to
-        terminate early in many cases, significantly improving runtime.
+    :param max_subset_length: The maximum length of subsets to return. Allows the backtracking algorithm to terminate
+        early in many cases, significantly improving runtime.
 
     :return: Generates of lists containing the masses of valid subsets.
     """
-    n = len(l)
 
-    # initialise dynamic programming array
-    dp = numpy.ndarray([n+1, mass+1], bool)
+    # the target mass is used as a python int, as shifting the python int words of the matrix by numpy scalars fails
+    mass = operator.index(mass)
 
-    # subsets can always equal 0
-    for i in range(n+1):
-        dp[i][0] = True
+    masses, l = sort_masses(l)
+    dp = build_dp(masses, mass)
+
+    # backtrack through the matrix one row at a time to obtain all solutions
+    return (sorted(subset) for subset in enumerate_paths(l, dp, len(l), mass, max_subset_length))
+
+
+def split_paths(l, dp, n, mass, max_subset_length, levels):
+    """
+    Expands the first few levels of the backtracking tree explored by enumerate_paths, so that the remaining subtrees
+    can be backtracked independently. Partial subsets with the same remaining mass and length share a subtree, so
+    they are grouped under a single seed and each subtree is only backtracked once.
+
+    :param l: A list of masses from which to identify subsets.
 
-    # empty subsets do not have non-zero sums
-    for i in range(mass):
-        dp[0][i+1] = False
+    :param dp: The dynamic programming boolean matrix, bit-packed into rows of numpy.uint64 words.
 
-    # fill in the remaining boolean matrix
-    for i in range(n):
-        for j in range(mass+1):
-            if j >= l[i]:
-                dp[i+1][j] = dp[i][j] or dp[i][j-l[i]]
-            else:
-                dp[i+1][j] = dp[i][j]
+    :param n: The size of l.
+
+    :param mass: The target mass of the sum of the substructures.
+
+    :param max_subset_length: The maximum length of subsets to return.
+
+    :param levels: The number of levels of the tree to expand.
+
+    :return: A dictionary mapping (n, mass, length) seeds, one for each feasible subtree, to a list of the partial
+        subsets that reach them.
+    """
 
-    # backtrack through the matrix recursively to obtain all solutions
-    return find_path(l, dp, n, mass, max_subset_length)
+    seeds = {(n, mass, 0): [()]}
+
+    for _ in range(levels):
+        expanded = {}
+
+        for (seed_n, seed_mass, length), paths in seeds.items():
+
+            # the paths are already solutions, or are leaves of the tree
+            if seed_mass == 0 or seed_n == 0:
+                expanded.setdefault((seed_n, seed_mass, length), []).extend(paths)
+                continue
+
+            # the remaining masses cannot sum up to the target value
+            if not dp[seed_n, seed_mass >> 6] & BITS[seed_mass & 63]:
+                continue
+
+            expanded.setdefault((seed_n-1, seed_mass, length), []).extend(paths)
+
+            if length < max_subset_length and seed_mass >= l[seed_n-1]:
+                expanded.setdefault((seed_n-1, seed_mass - l[seed_n-1], length + 1), []).extend(
+                    path + (l[seed_n-1],) for path in paths)
+
+        seeds = expanded
+
+    return seeds
+
+
+# the masses and dynamic programming matrix, set once in each worker process by init_worker
+worker_state = {}
+
+
+def init_worker(l, shm_name, shape, max_subset_length):
+    """
+    Stores the inputs shared by every subtree in a worker process. The dynamic programming matrix is attached from
+    shared memory rather than being copied to each worker.
+
+    :param l: A list of masses from which to identify subsets.
+
+    :param shm_name: The name of the shared memory block holding the dynamic programming matrix.
+
+    :param shape: The shape of the dynamic programming matrix, see dp_shape.
+
+    :param max_subset_length: The maximum length of subsets to return.
+    """
+
+    shm = multiprocessing.shared_memory.SharedMemory(name=shm_name)
+
+    # the shared memory block must be kept open for as long as the matrix is in use
+    worker_state.update(l=l, shm=shm, dp=numpy.ndarray(shape, dtype=numpy.uint64, buffer=shm.buf),
+                        max_subset_length=max_subset_length)
+
+
+def walk_path(seed):
+    """
+    Backtracks through a single subtree in a worker process.
+
+    :param seed: A (n, mass, length) tuple generated by split_paths.
+
+    :return: A tuple containing the seed and a list of tuples containing the masses that complete each of its partial
+        subsets.
+    """
+
+    n, mass, length = seed
+
+    return seed, list(enumerate_paths(worker_state["l"], worker_state["dp"], n, mass,
+                                      worker_state["max_subset_length"] - length))
+
+
+def subset_sum_parallel(l, mass, max_subset_length=3, processes=None):
+    """
+    Parallel implementation of subset_sum_dp. The dynamic programming matrix is built as usual, as each row depends on
+    the previous row, but the backtracking phase is split between processes. The top levels of the backtracking tree are
+    expanded in this process and the remaining subtrees, which are independent of one another, are backtracked by a pool
+    of worker processes using enumerate_paths, as in subset_sum_dp. Each subtree is only backtracked once, however many
+    partial subsets reach it. The matrix is built in shared memory so that workers can read it without it being copied.
+    Subsets are generated in the order that the subtrees are completed.
+
+    :param l: A list of masses from which to identify subsets.
+
+    :param mass: The target mass of the sum of the substructures.
+
+    :param max_subset_length: The maximum length of subsets to return. Allows the backtracking algorithm to terminate
+        early in many cases, significantly improving runtime.
+
+    :param processes: The number of worker processes to use, defaults to the number of CPUs.
+
+    :return: Generates of lists containing the masses of valid subsets.
+    """
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    # the target mass is used as a python int, as shifting the python int words of the matrix by numpy scalars fails
+    mass = operator.index(mass)
+
+    masses, l = sort_masses(l)
+    shape = dp_shape(l, mass)
+    shm = multiprocessing.shared_memory.SharedMemory(create=True, size=8 * shape[0] * shape[1])
+
+    try:
+        dp = build_dp(masses, mass, shm.buf)
+
+        # expand enough levels to give each process a few subtrees to balance the load
+        levels = min(len(l), math.ceil(math.log2(processes)) + 2)
+        seeds = split_paths(l, dp, len(l), mass, max_subset_length, levels)
+
+        # release the matrix before the shared memory is closed
+        del dp
+
+        # workers are not forked from this process, which may have started numba's threads to fill the matrix, as
+        # forking a process with running threads can hang - leaving the pool terminates the workers, so a caller that
+        # stops early doesn't wait for the remaining subtrees to be backtracked
+        context = multiprocessing.get_context(
+            "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+
+        with context.Pool(processes, initializer=init_worker,
+                          initargs=(l, shm.name, shape, max_subset_length)) as pool:
+            for seed, subsets in pool.imap_unordered(walk_path, seeds):
+                for path in seeds[seed]:
+                    for subset in subsets:
+                        yield sorted(path + subset)
+
+    finally:
+        shm.close()
+        shm.unlink()
 
 
 if __name__ == "__main__":
@@ -160,7 +705,7 @@ if __name__ == "__main__":
     print("M1 Integer")
     i = 0
     start = datetime.datetime.now()
-    for item in subset_sum_inexact(l, s):
+    for item in subset_sum(l, s):
         if len(item) <= max_subset_length:
             i += 1
     print("Runtime: " + str(datetime.datetime.now() - start))
@@ -185,3 +730,12 @@ if __name__ == "__main__":
     print("Runtime: " + str(datetime.datetime.now() - start))
     print("Number of subsets: " + str(i))
     print("---")
+
+    print("M2 Parallel")
+    i = 0
+    start = datetime.datetime.now()
+    for item in subset_sum_parallel(l, s, max_subset_length=3):
+        i += 1
+    print("Runtime: " + str(datetime.datetime.now() - start))
+    print("Number of subsets: " + str(i))
+    print("---")